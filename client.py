@@ -2,23 +2,27 @@
 """
 Client for Live Speech Transcription
 - Captures audio from microphone
-- Streams raw audio to the server via TCP
+- Streams raw audio to the server via TCP (or sequenced UDP datagrams)
 - Supports GUI for mic selection, mute, and visual feedback
 """
 
 import sys
 import socket
+import select
+import struct
 import pyaudio
 import time
-import argparse
 import threading
-import math
-import numpy as np
-import json
-import os
+import queue
+import warnings
+with warnings.catch_warnings():
+    # audioop is deprecated (PEP 594) but still the fastest peak meter in 3.11/3.12
+    warnings.simplefilter("ignore", DeprecationWarning)
+    import audioop
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QLabel, QComboBox, 
-                             QLineEdit, QMessageBox, QFrame, QProgressBar)
+                             QLineEdit, QMessageBox, QFrame, QProgressBar,
+                             QGraphicsOpacityEffect)
 from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer, QSettings
 from PyQt6.QtGui import QFont, QColor
 
@@ -49,44 +53,113 @@ LIGHT_STYLE = """
         border-radius: 20px;
     }
 """
+
+PULSE_SILENT_STYLE = """
+    QFrame#PulseCircle { 
+        background-color: #f0f0f0; 
+        border-radius: 50px; 
+        border: 2px solid #ddd; 
+    }
+"""
+
+# Active pulse look is fixed; the level only drives a QGraphicsOpacityEffect on top
+PULSE_ACTIVE_STYLE = """
+    QFrame#PulseCircle {
+        background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1, 
+                          stop:0 rgba(0, 242, 254, 0.8), 
+                          stop:1 rgba(79, 255, 176, 0.8));
+        border: 8px solid qlineargradient(x1:0, y1:0, x2:1, y2:0, 
+                stop:0 #00f2fe, stop:1 #4facfe);
+        border-radius: 50px;
+    }
+"""
+
+# Level meter buckets: silent, quiet, capturing, peak, muted
+# Each is (pulse stylesheet, pulse opacity, status text, status stylesheet)
+METER_BUCKETS = [
+    (PULSE_SILENT_STYLE, 1.0, "⚪ Silent", "color: gray; font-weight: bold;"),
+    (PULSE_ACTIVE_STYLE, 0.45, "🟢 Capturing...", "color: #00f2fe; font-weight: bold;"),
+    (PULSE_ACTIVE_STYLE, 0.75, "🟢 Capturing...", "color: #00f2fe; font-weight: bold;"),
+    (PULSE_ACTIVE_STYLE, 1.0, "🔴 Peak/Loud", "color: #ff5252; font-weight: bold;"),
+    (PULSE_SILENT_STYLE, 1.0, "🔇 Muted", "color: gray; font-weight: bold;"),
+]
+METER_MUTED = len(METER_BUCKETS) - 1
 # ===========================
 
-# Audio settings (must match server)
+# Audio settings (SAMPLE_RATE and format must match the server; CHUNK_SIZE is frames here, bytes there, and differs on purpose)
 SAMPLE_RATE = 16000
-CHUNK_SIZE = 4096
+CHUNK_SIZE = 256 # 16 ms per PortAudio callback
 CHANNELS = 1
 FORMAT = pyaudio.paInt16
+METER_INTERVAL = 0.066 # Seconds between level measurements; the GUI polls at the same rate
+SEND_BUFFER_BYTES = 1 << 16 # Kernel send buffer (~2 s of audio) so WAN round trips don't starve the link
+SEND_STALL_TIMEOUT = 0.05 # Seconds to wait for socket space before dropping a chunk
+CAPTURE_QUEUE_CHUNKS = 8 # Captured chunks buffered for the sender (~128 ms) before dropping the oldest
+HANDSHAKE_HEADER = struct.Struct('!H') # Length of the UTF-8 "name|lang" payload that follows (network order)
+HANDSHAKE_ACK = b'\x01'
+IPTOS_LOWDELAY = 0x10 # IP_TOS value asking routers/qdiscs to favour this flow
+AUDIO_SO_PRIORITY = 6 # Linux SO_PRIORITY band for the audio socket
+UDP_HEADER = struct.Struct('<IQ') # seq (uint32), capture time in us (uint64)
+STREAMER_JOIN_TIMEOUT = 2.0 # Seconds closeEvent waits for the streamer before leaving PortAudio to exit
 
 class AudioStreamer(QObject):
     """Handles audio streaming in a background thread"""
     status_changed = pyqtSignal(str)
     error_occurred = pyqtSignal(str)
     finished = pyqtSignal()
-    audio_level = pyqtSignal(float) # 0.0 to 1.0
+    drops_occurred = pyqtSignal(int) # Total chunks dropped because the network fell behind
+    streaming_changed = pyqtSignal(bool) # True once audio is flowing, False when the connection drops
 
-    def __init__(self, server_ip, server_port, device_index, client_name, lang_code):
+    def __init__(self, pa, server_ip, server_port, device_index, client_name, lang_code, transport="tcp"):
         super().__init__()
+        self.p = pa # Shared PyAudio instance, owned (and terminated) by the caller
         self.server_ip = server_ip
         self.server_port = server_port
         self.device_index = device_index
         self.client_name = client_name
         self.lang_code = lang_code
+        self.transport = transport
         self.running = False
         self.muted = False
+        self._thread = None
+        self._stop_event = threading.Event() # Cuts the reconnect back-off short on stop()
         self.sock = None
-        self.p = None
+        self.udp_sock = None
         self.stream = None
+        self._frames = queue.Queue(maxsize=CAPTURE_QUEUE_CHUNKS)
+        self._seq = 0
+        self._peak = 0 # Highest sample since the GUI last polled (see take_level)
+        self._last_check_time = 0.0 # Drop reports and UDP liveness checks
+        # One counter per writing thread: a shared += from both would lose increments
+        self._capture_drops = 0 # PortAudio callback thread
+        self._send_drops = 0 # Streaming thread
+        self._drops_reported = 0
 
     def start(self):
         self.running = True
-        threading.Thread(target=self._run, daemon=True).start()
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
 
     def stop(self):
         self.running = False
+        self._stop_event.set()
+
+    def wait(self, timeout=None):
+        """Blocks until the streaming thread has exited; returns False on timeout"""
+        if self._thread:
+            self._thread.join(timeout)
+            return not self._thread.is_alive()
+        return True
 
     def set_mute(self, muted):
         self.muted = muted
 
+    @property
+    def drops(self):
+        """Total chunks dropped, at capture or at send"""
+        return self._capture_drops + self._send_drops
+
     def _run(self):
         retry_delay = 5  # Seconds to wait before retrying
         
@@ -95,48 +168,78 @@ class AudioStreamer(QObject):
                 self.status_changed.emit(f"Connecting to {self.server_ip}:{self.server_port}...")
                 
                 # 1. Create and connect socket
+                # In UDP mode the TCP connection is only a control channel (handshake + liveness)
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.sock.settimeout(10) # Prevent indefinite hanging
                 self.sock.connect((self.server_ip, self.server_port))
-                self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                handshake_msg = f"{self.client_name}|{self.lang_code}"
+                
+                if self.transport == "udp":
+                    self.udp_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                    self.udp_sock.connect((self.server_ip, self.server_port))
+                    # Tell the server which source port our datagrams come from
+                    handshake_msg += f"|udp:{self.udp_sock.getsockname()[1]}"
+                    self._seq = 0
+                    self._mark_low_latency(self.udp_sock)
+                else:
+                    self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                    # A bounded send buffer makes backpressure visible while covering the bandwidth-delay product
+                    self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SEND_BUFFER_BYTES)
+                    self._mark_low_latency(self.sock)
                 
                 # 2. Handshake
-                handshake_msg = f"{self.client_name}|{self.lang_code}"
-                self.sock.sendall(handshake_msg.encode('utf-8'))
-                time.sleep(0.1)
+                # Length-prefixed so it can't merge with audio; wait for the server's ACK
+                payload = handshake_msg.encode('utf-8')
+                self.sock.sendall(HANDSHAKE_HEADER.pack(len(payload)) + payload)
+                if self.sock.recv(1) != HANDSHAKE_ACK:
+                    raise ConnectionError("Server did not acknowledge the handshake")
                 
                 # 3. Audio Setup
-                self.p = pyaudio.PyAudio()
+                # Callback mode: PortAudio's thread hands over each small buffer and
+                # this thread only drains the bounded queue, so capture never waits on the network
+                self._frames = queue.Queue(maxsize=CAPTURE_QUEUE_CHUNKS)
                 self.stream = self.p.open(
                     format=FORMAT,
                     channels=CHANNELS,
                     rate=SAMPLE_RATE,
                     input=True,
                     input_device_index=self.device_index,
-                    frames_per_buffer=CHUNK_SIZE
+                    frames_per_buffer=CHUNK_SIZE,
+                    stream_callback=self._audio_cb
                 )
                 
+                self.sock.settimeout(None) # Sends are guarded by select() instead
                 self.status_changed.emit("🔴 Streaming Audio")
-                update_counter = 0
+                self.streaming_changed.emit(True)
                 # 4. Main Streaming Loop
                 while self.running:
-                    data = self.stream.read(CHUNK_SIZE, exception_on_overflow=False)
-                    update_counter += 1 
-
-                    # Check audio levels for the "Throb" effect
-                    if update_counter % 2 == 0:
-                       audio_data = np.frombuffer(data, dtype=np.int16)
-                       amplitude = np.max(np.abs(audio_data))
-                       level = min(1.0, amplitude / 32768.0)
-                       self.audio_level.emit(level)
+                    try:
+                        data = self._frames.get(timeout=0.5)
+                    except queue.Empty:
+                        continue
+
+                    # Periodic housekeeping (the level itself is measured in _audio_cb)
+                    now = time.monotonic()
+                    if now - self._last_check_time >= METER_INTERVAL:
+                       self._last_check_time = now
+
+                       drops = self.drops
+                       if drops != self._drops_reported:
+                           self._drops_reported = drops
+                           self.drops_occurred.emit(drops)
+
+                       # UDP has no connection state, so watch the control channel instead
+                       if self.udp_sock and self._control_closed():
+                           raise ConnectionResetError("Server closed the control channel")
                     
                     if not self.muted:
-                        self.sock.sendall(data)
+                        self._send_audio(data)
 
             except (socket.error, BrokenPipeError, ConnectionResetError) as e:
+                self.streaming_changed.emit(False)
                 self.status_changed.emit(f"Connection lost. Retrying in {retry_delay}s...")
                 self._cleanup() # Clean up current failed resources
-                time.sleep(retry_delay)
+                self._stop_event.wait(retry_delay)
                 continue # Jump back to the start of the 'while self.running' loop
                 
             except Exception as e:
@@ -146,26 +249,93 @@ class AudioStreamer(QObject):
         self._cleanup()
         self.finished.emit()
 
-    def _cleanup(self):
+    def take_level(self):
+        """Returns the peak level (0.0 to 1.0) since the previous call and resets it"""
+        peak, self._peak = self._peak, 0
+        return min(1.0, peak / 32768.0)
+
+    def _audio_cb(self, in_data, frame_count, time_info, status):
+        """PortAudio callback: measure the peak and queue the buffer for the streaming loop"""
+        amplitude = audioop.max(in_data, 2) # Peak of 16-bit PCM, computed in C
+        if amplitude > self._peak:
+            self._peak = amplitude # Held until the next poll so short transients still show
         try:
-            if self.stream:
-               self.stream.stop_stream()
-               self.stream.close()
-            if self.p:
-               self.p.terminate()
-            if self.sock:
-               self.sock.close()
-        except Exception:
-            pass # Silent fail during cleanup is okay
-        finally:
+            self._frames.put_nowait(in_data)
+        except queue.Full:
+            # Sender is behind: drop the oldest chunk to keep latency bounded
+            try:
+                self._frames.get_nowait()
+            except queue.Empty:
+                pass
+            self._frames.put_nowait(in_data) # Only producer, so there is room now
+            self._capture_drops += 1
+        return (None, pyaudio.paContinue)
+
+    def _mark_low_latency(self, sock):
+        """Best-effort QoS hints for the audio socket; not every platform supports them"""
+        try:
+            sock.setsockopt(socket.IPPROTO_IP, socket.IP_TOS, IPTOS_LOWDELAY)
+        except (AttributeError, OSError):
+            pass
+        try:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_PRIORITY, AUDIO_SO_PRIORITY)
+        except (AttributeError, OSError):
+            pass
+
+    def _send_audio(self, data):
+        """Sends one chunk over TCP, or as a sequenced datagram in UDP mode"""
+        if not self.udp_sock:
+            # Drop the chunk rather than let a stalled connection back up the capture queue
+            _, writable, _ = select.select([], [self.sock], [], SEND_STALL_TIMEOUT)
+            if not writable:
+                self._send_drops += 1
+                return
+            self.sock.sendall(data)
+            return
+        
+        # Sequence number + capture time let the server detect loss and reordering
+        header = UDP_HEADER.pack(self._seq, time.time_ns() // 1000)
+        self._seq = (self._seq + 1) & 0xFFFFFFFF
+        try:
+            self.udp_sock.send(header + data)
+        except ConnectionRefusedError:
+            pass # A lost datagram is not a lost session; the control channel decides that
+
+    def _control_closed(self):
+        """Non-blocking check for EOF on the TCP control channel"""
+        readable, _, _ = select.select([self.sock], [], [], 0)
+        return bool(readable) and not self.sock.recv(1)
+
+    def _cleanup(self):
+        # Each resource gets its own try so one failure can't leak the others
+        if self.stream:
+            try:
+                self.stream.stop_stream()
+                self.stream.close()
+            except Exception:
+                pass # Silent fail during cleanup is okay
             self.stream = None
-            self.p = None
-            self.sock = None    
+        if self.sock:
+            try:
+                self.sock.close()
+            except Exception:
+                pass
+            self.sock = None
+        if self.udp_sock:
+            try:
+                self.udp_sock.close()
+            except Exception:
+                pass
+            self.udp_sock = None
 
 class ClientGUI(QMainWindow):
     def __init__(self):
         super().__init__()
         self.streamer = None
+        self._pa = pyaudio.PyAudio() # Opened once; PortAudio init is slow
+        # Level meter polls the streamer at a fixed rate, independent of the chunk rate
+        self._level_timer = QTimer(self)
+        self._level_timer.timeout.connect(self.poll_level)
         self.init_ui()
         self.load_devices()
 
@@ -286,13 +456,10 @@ class ClientGUI(QMainWindow):
         self.pulse_container = QFrame()
         self.pulse_container.setFixedSize(80, 80)
         self.pulse_container.setObjectName("PulseCircle")
-        self.pulse_container.setStyleSheet("""
-            QFrame#PulseCircle {
-                background-color: #f0f0f0;
-                border-radius: 50px;
-                border: 2px solid #ddd;
-            }
-        """)
+        self.pulse_container.setStyleSheet(PULSE_SILENT_STYLE)
+        self._pulse_opacity = QGraphicsOpacityEffect(self.pulse_container)
+        self.pulse_container.setGraphicsEffect(self._pulse_opacity)
+        self._meter_bucket = None # Index into METER_BUCKETS currently shown
 
         # Add a mic icon inside the throbber
         pulse_layout = QVBoxLayout(self.pulse_container)
@@ -310,33 +477,6 @@ class ClientGUI(QMainWindow):
         # self.status_label.setStyleSheet("color: gray; font-weight: bold;")
         # layout.addWidget(self.status_label)
 
-        def save_settings(self):
-            """Saves current GUI inputs to a JSON file."""
-            settings = {
-                "name": self.name_input.text(),
-                "ip": self.ip_input.text(),
-                "port": self.port_input.text(),
-                "lang_index": self.lang_combo.currentIndex()
-            }
-            try:
-                with open("config.json", "w") as f:
-                    json.dump(settings, f)
-            except Exception as e:
-                print(f"Error saving settings: {e}")
-
-        def load_settings(self):
-            """Loads settings from JSON and populates the GUI."""
-            if os.path.exists("config.json"):
-                try:
-                    with open("config.json", "r") as f:
-                        settings = json.load(f)
-                        self.name_input.setText(settings.get("name", ""))
-                        self.ip_input.setText(settings.get("ip", "127.0.0.1"))
-                        self.port_input.setText(settings.get("port", "5001"))
-                        self.lang_combo.setCurrentIndex(settings.get("lang_index", 0))
-                except Exception as e:
-                    print(f"Error loading settings: {e}")
-        
         # Buttons
         btn_layout = QHBoxLayout()
         
@@ -391,20 +531,18 @@ class ClientGUI(QMainWindow):
         settings.setValue("language", self.lang_combo.currentData())
 
     def load_devices(self):
-        p = pyaudio.PyAudio()
+        p = self._pa
         info = p.get_host_api_info_by_index(0)
         numdevices = info.get('deviceCount')
         
         default_device_index = p.get_default_input_device_info()['index']
         
         for i in range(0, numdevices):
-            if (p.get_device_info_by_host_api_device_index(0, i).get('maxInputChannels')) > 0:
-                name = p.get_device_info_by_host_api_device_index(0, i).get('name')
-                self.mic_combo.addItem(name, i)
+            device = p.get_device_info_by_host_api_device_index(0, i)
+            if device.get('maxInputChannels') > 0:
+                self.mic_combo.addItem(device.get('name'), i)
                 if i == default_device_index:
                     self.mic_combo.setCurrentIndex(self.mic_combo.count() - 1)
-        
-        p.terminate()
 
     def toggle_stream(self):
         if not self.streamer or not self.streamer.running:
@@ -425,11 +563,12 @@ class ClientGUI(QMainWindow):
         name = self.name_input.text()
         lang = self.lang_combo.currentData() # Get the 'en', 'es', etc. from the dropdown
         
-        self.streamer = AudioStreamer(ip, port, idx, name, lang)
+        self.streamer = AudioStreamer(self._pa, ip, port, idx, name, lang)
         self.streamer.status_changed.connect(self.update_status)
         self.streamer.error_occurred.connect(self.on_error)
         self.streamer.finished.connect(self.on_finished)
-        self.streamer.audio_level.connect(self.update_indicator)
+        self.streamer.drops_occurred.connect(self.on_drops)
+        self.streamer.streaming_changed.connect(self.on_streaming_changed)
         
         self.streamer.start()
         self.btn_connect.setText("Stop Streaming")
@@ -453,8 +592,8 @@ class ClientGUI(QMainWindow):
             self.streamer.set_mute(muted)
             if muted:
                 self.btn_mute.setText("Unmute")
+                self._reset_pulse()
                 self.status_label.setText("🔇 Muted")
-                self.indicator_frame.setStyleSheet("background-color: #ddd; border-radius: 15px;")
             else:
                 self.btn_mute.setText("Mute")
                 self.status_label.setText("🔴 Streaming Audio")
@@ -467,46 +606,46 @@ class ClientGUI(QMainWindow):
             self.setStyleSheet(LIGHT_STYLE)
             self.btn_theme.setText("🌙 Dark Mode")            
 
+    def on_streaming_changed(self, streaming):
+        # Only meter while audio flows, so connect/retry messages stay on screen
+        if streaming:
+            self._level_timer.start(int(METER_INTERVAL * 1000))
+        else:
+            self._level_timer.stop()
+            self._reset_pulse()
+
+    def poll_level(self):
+        if self.streamer:
+            self.update_indicator(self.streamer.take_level())
+
     def update_indicator(self, level):
-        """Updates the dynamic level meter with a colorful pulsing gradient"""
-        if self.btn_mute.isChecked() or level < 0.01:
-            self.pulse_container.setStyleSheet("""
-                QFrame#PulseCircle { 
-                    background-color: #f0f0f0; 
-                    border-radius: 50px; 
-                    border: 2px solid #ddd; 
-                }
-            """)
-            self.status_label.setText("⚪ Silent")
-            self.status_label.setStyleSheet("color: gray; font-weight: bold;")
+        """Updates the level meter; widgets are only touched when the bucket changes"""
+        if self.btn_mute.isChecked():
+            bucket = METER_MUTED # Keeps "Muted" on screen instead of reading as silence
+        elif level < 0.01:
+            bucket = 0
+        elif level > 0.8:
+            bucket = 3
+        else:
+            bucket = 1 if level < 0.4 else 2
+        if bucket == self._meter_bucket:
             return
         
-        # Calculate dynamic values based on volume
-        thickness = int(2 + (level * 12))
-        # Map level to a vibrant color range (Cyan to Lime)
-        glow_opacity = 0.2 + (level * 0.6)
-        
-        # Apply a Modern Gradient Style
-        self.pulse_container.setStyleSheet(f"""
-            QFrame#PulseCircle {{
-                background-color: qlineargradient(spread:pad, x1:0, y1:0, x2:1, y2:1, 
-                                  stop:0 rgba(0, 242, 254, {glow_opacity}), 
-                                  stop:1 rgba(79, 255, 176, {glow_opacity}));
-                border: {thickness}px solid qlineargradient(x1:0, y1:0, x2:1, y2:0, 
-                        stop:0 #00f2fe, stop:1 #4facfe);
-                border-radius: 50px;
-            }}
-        """)
+        style, opacity, text, text_style = METER_BUCKETS[bucket]
+        if self._meter_bucket is None or style is not METER_BUCKETS[self._meter_bucket][0]:
+            self.pulse_container.setStyleSheet(style)
+        self._pulse_opacity.setOpacity(opacity)
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(text_style)
+        self._meter_bucket = bucket
 
-        # Update status text with color matching the pulse
-        if level > 0.8:
-            self.status_label.setText("🔴 Peak/Loud")
-            self.status_label.setStyleSheet("color: #ff5252; font-weight: bold;")
-        else:
-            self.status_label.setText("🟢 Capturing...")
-            self.status_label.setStyleSheet("color: #00f2fe; font-weight: bold;")
+    def _reset_pulse(self):
+        self.pulse_container.setStyleSheet(PULSE_SILENT_STYLE)
+        self._pulse_opacity.setOpacity(1.0)
+        self._meter_bucket = None
 
     def on_finished(self):
+        self._level_timer.stop()
         self.btn_connect.setText("Connect & Stream")
         self.btn_connect.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; border-radius: 5px;")
         self.btn_mute.setEnabled(False)
@@ -516,10 +655,13 @@ class ClientGUI(QMainWindow):
             QPushButton { background-color: #cccccc; color: black; font-weight: bold; border-radius: 5px; }
         """)
         self.inputs_enabled(True)
+        self._reset_pulse()
         self.status_label.setText("Stopped")
-        self.pulse_container.setStyleSheet("QFrame#PulseCircle { background-color: #f0f0f0; border-radius: 50px; border: 2px solid #ddd; }")
         # self.indicator_frame.setStyleSheet("background-color: #ddd; border-radius: 15px;") # Removed as it doesn't exist
 
+    def on_drops(self, count):
+        self.status_label.setToolTip(f"Dropped {count} audio chunks on a stalled connection")
+
     def on_error(self, msg):
         self.status_label.setText(f"Error: {msg}")
         QMessageBox.critical(self, "Error", msg)
@@ -535,6 +677,16 @@ class ClientGUI(QMainWindow):
         self.port_input.setEnabled(enabled)
         self.mic_combo.setEnabled(enabled)
 
+    def closeEvent(self, event):
+        finished = True
+        if self.streamer:
+            self.streamer.stop()
+            # The thread may still be opening or closing its stream on the shared PyAudio
+            finished = self.streamer.wait(STREAMER_JOIN_TIMEOUT)
+        if finished:
+            self._pa.terminate()
+        event.accept()
+
 def list_microphones():
     p = pyaudio.PyAudio()
     info = p.get_host_api_info_by_index(0)
@@ -543,13 +695,15 @@ def list_microphones():
     print("\n🎤 Available Microphones:")
     print("-" * 50)
     for i in range(0, numdevices):
-        if (p.get_device_info_by_host_api_device_index(0, i).get('maxInputChannels')) > 0:
-            name = p.get_device_info_by_host_api_device_index(0, i).get('name')
-            print(f"[{i}] {name}")
+        device = p.get_device_info_by_host_api_device_index(0, i)
+        if device.get('maxInputChannels') > 0:
+            print(f"[{i}] {device.get('name')}")
     print("-" * 50)
     p.terminate()
 
 def main():
+    import argparse # Only the script entry point needs it, not importers of this module
+    
     parser = argparse.ArgumentParser(description="Audio Streaming Client")
     parser.add_argument("--miclist", action="store_true", help="List available microphones and exit")
     parser.add_argument("--nogui", action="store_true", help="Run in headless CLI mode")
@@ -557,6 +711,8 @@ def main():
     parser.add_argument("--server", type=str, default=DEFAULT_SERVER_IP, help="Server IP")
     parser.add_argument("--port", type=int, default=DEFAULT_SERVER_PORT, help="Server port")
     parser.add_argument("--mic", type=int, default=None, help="Microphone index (for CLI mode)")
+    parser.add_argument("--lang", type=str, default="en", help="Language code (for CLI mode)")
+    parser.add_argument("--udp", action="store_true", help="Stream audio as UDP datagrams (for CLI mode)")
     
     args = parser.parse_args()
 
@@ -573,7 +729,9 @@ def main():
             
         print(f"🎙️  Client: {args.name}")
         
-        streamer = AudioStreamer(args.server, args.port, args.mic, args.name)
+        transport = "udp" if args.udp else "tcp"
+        pa = pyaudio.PyAudio()
+        streamer = AudioStreamer(pa, args.server, args.port, args.mic, args.name, args.lang, transport)
         
         # Simple event loop for CLI
         stop_event = threading.Event()
@@ -581,19 +739,26 @@ def main():
         def on_status(msg): print(f"ℹ️  {msg}")
         def on_error(msg): print(f"❌ {msg}"); stop_event.set()
         def on_finished(): stop_event.set()
+        def on_drops(count): print(f"⚠️  Dropped {count} audio chunks on a stalled connection")
         
         streamer.status_changed.connect(on_status)
         streamer.error_occurred.connect(on_error)
         streamer.finished.connect(on_finished)
+        streamer.drops_occurred.connect(on_drops)
         
         streamer.start()
         
         try:
-            while not stop_event.is_set():
-                time.sleep(0.1)
+            # Timed waits: an untimed one can't be interrupted by Ctrl+C on Windows
+            while not stop_event.wait(0.5):
+                pass
         except KeyboardInterrupt:
             print("\nStopping...")
             streamer.stop()
+            streamer.wait(STREAMER_JOIN_TIMEOUT) # Let the streamer release the device and socket
+        finally:
+            if streamer.wait(0):
+                pa.terminate()
             
     else:
         # GUI Mode
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Server for Live Speech Transcription
-- Listens for TCP connections from clients
+- Listens for TCP connections from clients (audio over TCP or sequenced UDP)
 - Transcribes audio from each client using Speechmatics
 - Displays transcripts in a GUI
 - Visualizes connected clients with circular icons and audio indicators
@@ -10,17 +10,18 @@ import os
 from dotenv import load_dotenv
 import sys
 import socket
+import struct
 import threading
 import time
-import queue
-import math
+import asyncio
 from datetime import datetime
+import numpy as np
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTextEdit, QLabel, 
                              QStatusBar, QListWidget, QGridLayout, QFrame,
                              QScrollArea)
 from PyQt6.QtCore import Qt, pyqtSignal, QObject, QTimer, QRect
-from PyQt6.QtGui import QFont, QTextCursor, QPainter, QColor, QPen, QBrush, QLinearGradient, QRadialGradient
+from PyQt6.QtGui import QFont, QTextCursor, QTextCharFormat, QPainter, QPixmap, QColor, QPen, QBrush, QLinearGradient, QRadialGradient
 from speechmatics.client import WebsocketClient
 from speechmatics.models import ConnectionSettings, AudioSettings, TranscriptionConfig
 from PyQt6.QtWidgets import QGraphicsDropShadowEffect 
@@ -32,6 +33,10 @@ API_KEY = os.getenv("SPEECHMATICS_API_KEY")
 DEFAULT_LANGUAGE = "en"
 CONNECTION_URL = "wss://eu2.rt.speechmatics.com/v2"
 SERVER_PORT = 5001
+SOCKET_RCVBUF = 1 << 17 # Many chunks of headroom so reads don't split or stall
+TRANSCRIPT_MAX_BLOCKS = 2000 # Oldest transcript blocks are dropped past this, bounding layout cost
+LOG_MAX_BLOCKS = 1000
+TRANSCRIPT_FLUSH_MS = 33 # Words arriving within this window are rendered in one document edit
 
 DARK_STYLE = """
     QMainWindow { background-color: #121212; }
@@ -59,58 +64,125 @@ LIGHT_STYLE = """
 """
 # ===========================
 
-# Audio settings (must match client)
+# Audio settings (SAMPLE_RATE and format must match the client; CHUNK_SIZE is bytes here, frames there, and differs on purpose)
 SAMPLE_RATE = 16000
-CHUNK_SIZE = 4096
+CHUNK_SIZE = 4096 # Bytes, not frames like the client's: max per read and per AddAudio message (reads return early)
+HANDSHAKE_HEADER = struct.Struct('!H') # Length of the UTF-8 "name|lang" payload that follows (network order)
+HANDSHAKE_MAX_BYTES = 1024 # Longer claims are treated as a bad client, not allocated
+HANDSHAKE_ACK = b'\x01'
+HANDSHAKE_TIMEOUT = 10 # Seconds a new connection gets to send its handshake before it is dropped
+UDP_HEADER = struct.Struct('<IQ') # seq (uint32), capture time in us (uint64)
+MAX_GAP_FILL = 8 # Lost datagrams replaced with silence before we just resync
+STREAM_QUEUE_BYTES = SAMPLE_RATE * 2 // 4 # 250 ms of audio buffered ahead of the websocket send
+STREAM_STALL_TIMEOUT = 0.5 # Seconds the pump waits for queue space before dropping the oldest chunk
+ACTIVITY_HEARTBEAT = 0.05 # Seconds between repeated audio_activity emits (matches the 20 fps pulse)
+
+# Punctuation marks that should NOT have a preceding space
+NO_SPACE_PUNCT = frozenset({'.', ',', '!', '?', ':', ';', ')', ']', '}', '"'})
+SENTENCE_END = frozenset('.!?')
+LANG_FLAGS = {"hi": "🇮🇳", "ja": "🇯🇵", "en": "🇬🇧", "es": "🇪🇸", "fr": "🇫🇷", "de": "🇩🇪"}
 
 class SentenceBuffer:
     """Buffer to stream words immediately (Per Client)"""
     def __init__(self, client_name, signals):
+        # No lock: words are only ever added from the server's event loop
         self.client_name = client_name
         self.signals = signals
-        self.lock = threading.Lock()
         self.new_sentence = True 
         
-    def add_word(self, word):
-        with self.lock:
-            word = word.strip()
-            if not word: return
-            
-            # 1. Capitalization Logic (Start of sentence)
-            if self.new_sentence and len(word) > 0 and word[0].isalnum():
-                word = word[0].upper() + word[1:]
-            
-            # 2. Spacing Logic
-            # Punctuation marks that should NOT have a preceding space
-            no_space_punct = {'.', ',', '!', '?', ':', ';', ')', ']', '}', '"'}
-            
-            # Check if we should add a space before this word
-            # We add a space unless it's a punctuation mark or it's the very start (managed by UI block mostly)
-            # or if it's a currency symbol maybe?
-            
-            prefix = " "
-            if word in no_space_punct or word.startswith("'"):
-                prefix = ""
-            
-            # Special case: If it's the very first word of a sentence, we might still want a space 
-            # if it's not the start of the block. But since we stream, we can't easily know.
-            # We'll default to prepending space for words, which HTML collapses if redundant.
-            # But we must be careful with punctuation.
-            
-            text_to_emit = f"{prefix}{word}"
-            
-            self.signals.new_transcript.emit(self.client_name, text_to_emit)
-            
-            # 3. Update State
-            # Check if this word acts as a sentence terminator
-            if word.endswith(('.', '!', '?')):
-                self.new_sentence = True
-            else:
-                self.new_sentence = False
+    def add_words(self, words):
+        """Formats a whole AddTranscript batch and emits it as one string"""
+        text = "".join(filter(None, map(self._format_word, words)))
+        if text:
+            self.signals.new_transcript.emit(self.client_name, text)
+        
+    def _format_word(self, word):
+        """Returns the word with its spacing/capitalization applied, and advances sentence state"""
+        word = word.strip()
+        if not word: return None
+        
+        # 1. Capitalization Logic (Start of sentence)
+        if self.new_sentence and len(word) > 0 and word[0].isalnum():
+            word = word[0].upper() + word[1:]
+        
+        # 2. Spacing Logic
+        # Check if we should add a space before this word
+        # We add a space unless it's a punctuation mark or it's the very start (managed by UI block mostly)
+        # or if it's a currency symbol maybe?
+        
+        prefix = " "
+        if word in NO_SPACE_PUNCT or word[0] == "'":
+            prefix = ""
+        
+        # Special case: If it's the very first word of a sentence, we might still want a space 
+        # if it's not the start of the block. But since we stream, we can't easily know.
+        # We'll default to prepending space for words, which HTML collapses if redundant.
+        # But we must be careful with punctuation.
+        
+        text_to_emit = f"{prefix}{word}"
+        
+        # 3. Update State
+        # Check if this word acts as a sentence terminator
+        if word[-1] in SENTENCE_END:
+            self.new_sentence = True
+        else:
+            self.new_sentence = False
+        return text_to_emit
 
     def force_flush(self):
         pass
 
+class DatagramChannel:
+    """Per-client UDP audio feed exposing the same async read() as a StreamReader"""
+    def __init__(self, control_reader):
+        self.control = control_reader
+        self.packets = asyncio.Queue(maxsize=64)
+        self.expected_seq = None
+        self.lost = 0
+        self.pending = b''
+        
+    def feed(self, packet):
+        """Called by UdpRouter on the server's event loop"""
+        if len(packet) <= UDP_HEADER.size: return
+        seq, _ = UDP_HEADER.unpack_from(packet)
+        if self.packets.full():
+            # Consumer stalled: drop the oldest to stay live; read() counts it from the seq gap
+            self.packets.get_nowait()
+        self.packets.put_nowait((seq, packet[UDP_HEADER.size:]))
+            
+    async def read(self, size):
+        while not self.pending:
+            try:
+                seq, payload = await asyncio.wait_for(self.packets.get(), 0.5)
+            except asyncio.TimeoutError:
+                # Silence on the wire: make sure the client is still there
+                if self.control.at_eof(): return b''
+                continue
+            
+            if self.expected_seq is not None:
+                gap = (seq - self.expected_seq) & 0xFFFFFFFF
+                if gap >= 1 << 31: 
+                    continue # Late or duplicate datagram, already played past it
+                if gap:
+                    # Keep the timeline intact for Speechmatics by filling short holes
+                    self.lost += gap
+                    payload = bytes(len(payload) * min(gap, MAX_GAP_FILL)) + payload
+            self.expected_seq = (seq + 1) & 0xFFFFFFFF
+            self.pending = payload
+        
+        data, self.pending = self.pending[:size], self.pending[size:]
+        return data
+
+class UdpRouter(asyncio.DatagramProtocol):
+    """Routes incoming datagrams to the channel registered for their source address"""
+    def __init__(self, routes):
+        self.routes = routes
+        
+    def datagram_received(self, data, addr):
+        channel = self.routes.get(addr)
+        if channel:
+            channel.feed(data)
+
 class TranscriptSignals(QObject):
     """Signals for updating GUI from background threads"""
     new_transcript = pyqtSignal(str, str)  # client_name, text
@@ -122,31 +194,62 @@ class TranscriptSignals(QObject):
 
 class ClientWidget(QWidget):
     """Circular widget representing a connected client"""
+    # Geometry constants
+    CENTER_Y = 60
+    RADIUS = 40
+    
     def __init__(self, name, lang_code="en"):
         super().__init__()
         self.name = name
         self.lang_code = lang_code
+        self.flag = LANG_FLAGS.get(lang_code, "🌐")
         self.is_active = False
+        self.is_dark = False # Set by ServerApp.toggle_theme; picks the name label color
         self.setFixedSize(120, 140) # Increased size for glow
         
-        # Pulse Animation
-        self.pulse_timer = QTimer(self)
-        self.pulse_timer.timeout.connect(self.update_pulse)
+        # Pulse Animation (ticked by ServerApp's shared timer)
         self.pulse_alpha = 0
         self.pulse_direction = 1
         
+        # Circle, initial, badge and name only change with activity/theme; cached between frames
+        self._static_pix = None
+        self._static_key = None
+        
+        # Paint resources built once; per frame only the glow's center alpha changes
+        center_x = self.width() // 2
+        radius = self.RADIUS
+        glow_radius = radius + 15
+        self._glow_color = QColor(76, 175, 80, 100)
+        self._glow_grad = QRadialGradient(center_x, self.CENTER_Y, glow_radius)
+        self._glow_grad.setColorAt(1, QColor(76, 175, 80, 0)) # Fades to transparent
+        self._glow_rect = QRect(center_x - glow_radius, self.CENTER_Y - glow_radius,
+                                glow_radius * 2, glow_radius * 2)
+        self._bg_grad = QLinearGradient(0, self.CENTER_Y - radius, 0, self.CENTER_Y + radius)
+        self._bg_grad.setColorAt(0, QColor("#37474F")) # Light slate
+        self._bg_grad.setColorAt(1, QColor("#101416")) # Near black for depth
+        self._pen_active = QPen(QColor("#4CAF50"), 3)
+        self._pen_idle = QPen(QColor("#546E7A"), 2)
+        self._badge_pen = QPen(QColor("#263238"), 2)
+        self._initial_font = QFont("Segoe UI", 22, QFont.Weight.Bold)
+        self._flag_font = QFont("Segoe UI Emoji", 12)
+        self._name_font = QFont("Segoe UI", 10, QFont.Weight.DemiBold)
+        self._initial = name[0].upper() if name else "?"
+        # Truncate long names to keep UI clean
+        self._display_name = (name[:12] + '..') if len(name) > 12 else name
+        
     def set_active(self, active):
         if self.is_active != active:
             self.is_active = active
             
-            if self.is_active:
-                self.pulse_timer.start(50) # 20fps
-            else:
-                self.pulse_timer.stop()
+            if not self.is_active:
                 self.pulse_alpha = 0
                 
             self.update()
             
+    def is_on_screen(self):
+        """False when hidden or scrolled out of the clients area"""
+        return self.isVisible() and not self.visibleRegion().isEmpty()
+            
     def update_pulse(self):
         self.pulse_alpha += 10 * self.pulse_direction
         if self.pulse_alpha >= 100:
@@ -161,122 +264,137 @@ class ClientWidget(QWidget):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         
-        # Geometry constants
-        center_x = self.width() // 2
-        center_y = 60
-        radius = 40
-        
         # 1. Draw Pulsing Glow (if active)
         if self.is_active:
-            # We use a soft radial gradient for the glow to make it look realistic
-            glow_radius = radius + 15
-            glow_grad = QRadialGradient(center_x, center_y, glow_radius)
-            glow_grad.setColorAt(0, QColor(76, 175, 80, 100)) # Stronger green in center
-            glow_grad.setColorAt(1, QColor(76, 175, 80, 0))   # Fades to transparent
+            # Soft radial gradient; the center breathes with the pulse
+            self._glow_color.setAlpha(50 + self.pulse_alpha // 2)
+            self._glow_grad.setColorAt(0, self._glow_color)
             
-            painter.setBrush(glow_grad)
+            painter.setBrush(self._glow_grad)
             painter.setPen(Qt.PenStyle.NoPen)
-            painter.drawEllipse(center_x - glow_radius, center_y - glow_radius, 
-                                glow_radius * 2, glow_radius * 2)
+            painter.drawEllipse(self._glow_rect)
+
+        # 2-5. Static layers, re-rendered only when their inputs change
+        key = (self.is_active, self.is_dark, self.devicePixelRatioF())
+        if self._static_pix is None or self._static_key != key:
+            self._static_pix = self._render_static(self.is_dark)
+            self._static_key = key
+        painter.drawPixmap(0, 0, self._static_pix)
+
+    def _render_static(self, is_dark):
+        """Paints circle, initial, badge and name into a transparent pixmap"""
+        dpr = self.devicePixelRatioF()
+        pix = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pix.setDevicePixelRatio(dpr)
+        pix.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pix)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        
+        center_x = self.width() // 2
+        center_y = self.CENTER_Y
+        radius = self.RADIUS
 
         # 2. Main Circle Background (Modern Gradient)
-        gradient = QLinearGradient(0, center_y - radius, 0, center_y + radius)
-        gradient.setColorAt(0, QColor("#37474F")) # Light slate
-        gradient.setColorAt(1, QColor("#101416")) # Near black for depth
-    
-        painter.setBrush(gradient)
+        painter.setBrush(self._bg_grad)
         
         # Border: Glowing Green if active, subtle Slate if idle
-        if self.is_active:
-            pen = QPen(QColor("#4CAF50"), 3)
-        else:
-            pen = QPen(QColor("#546E7A"), 2)
-        painter.setPen(pen)
+        painter.setPen(self._pen_active if self.is_active else self._pen_idle)
         painter.drawEllipse(center_x - radius, center_y - radius, radius * 2, radius * 2)
 
         # 3. Draw Initial (Centered)
         painter.setPen(QColor("white")) # White text looks best on dark bubbles
-        painter.setFont(QFont("Segoe UI", 22, QFont.Weight.Bold))
-        initial = self.name[0].upper() if self.name else "?"
+        painter.setFont(self._initial_font)
         painter.drawText(QRect(center_x - radius, center_y - radius, radius * 2, radius * 2), 
-                         Qt.AlignmentFlag.AlignCenter, initial)
+                         Qt.AlignmentFlag.AlignCenter, self._initial)
         
         # 4. Draw Language Badge (Corner overlap)
-        lang_map = {"hi": "🇮🇳", "ja": "🇯🇵", "en": "🇬🇧", "es": "🇪🇸", "fr": "🇫🇷", "de": "🇩🇪"}
-        flag = lang_map.get(self.lang_code, "🌐")
-
         badge_size = 28
         badge_x = center_x + radius - 20
         badge_y = center_y + radius - 20
         
         # Badge background (White ring for contrast)
-        painter.setPen(QPen(QColor("#263238"), 2))
+        painter.setPen(self._badge_pen)
         painter.setBrush(QColor("white"))
         painter.drawEllipse(badge_x, badge_y, badge_size, badge_size)
         
         # Badge Emoji
-        painter.setFont(QFont("Segoe UI Emoji", 12))
+        painter.setFont(self._flag_font)
         painter.drawText(QRect(badge_x, badge_y, badge_size, badge_size), 
-                         Qt.AlignmentFlag.AlignCenter, flag)
+                         Qt.AlignmentFlag.AlignCenter, self.flag)
 
         # 5. Draw Client Name Label (Below the circle)
-        # Handle theme-based label color
-        is_dark = False
-        try:
-            if hasattr(self.window(), 'btn_theme'):
-                is_dark = self.window().btn_theme.isChecked()
-        except: pass
-        
         painter.setPen(QColor("white") if is_dark else QColor("black"))
-        painter.setFont(QFont("Segoe UI", 10, QFont.Weight.DemiBold))
-        
-        # Truncate long names to keep UI clean
-        display_name = (self.name[:12] + '..') if len(self.name) > 12 else self.name
+        painter.setFont(self._name_font)
         painter.drawText(QRect(0, center_y + radius + 5, self.width(), 25), 
-                         Qt.AlignmentFlag.AlignCenter, display_name)    
+                         Qt.AlignmentFlag.AlignCenter, self._display_name)
+        painter.end()
+        return pix
 
 
-class ClientHandler(threading.Thread):
+class ClientHandler:
     """Handles a single client connection and speech-to-text pipeline"""
-    def __init__(self, conn, addr, signals):
-        super().__init__()
-        self.conn = conn
-        self.addr = addr
+    def __init__(self, reader, writer, signals, udp_routes):
+        self.reader = reader
+        self.writer = writer
+        self.addr = writer.get_extra_info('peername')
         self.signals = signals
-        self.client_name = f"Client-{addr[1]}" 
+        self.udp_routes = udp_routes # (ip, port) -> DatagramChannel, shared with ServerThread
+        self.udp_route = None
+        self.client_name = f"Client-{self.addr[1]}" 
         self.buffer = SentenceBuffer(self.client_name, self.signals)
         self.running = True
         self.ws = None
         
     def handle_transcript(self, message):
         """Callback for Speechmatics AddTranscript event"""
-        if "results" in message:
-            for result in message["results"]:
-                # Speechmatics returns a list of alternatives; we take the most confident one
-                word = result["alternatives"][0]["content"]
-                # Feed the word into our sentence buffer for UI processing
-                self.buffer.add_word(word)
+        # Speechmatics returns a list of alternatives; we take the most confident one
+        words = [result["alternatives"][0]["content"] for result in message.get("results", ())]
+        # Feed the whole batch into our sentence buffer for UI processing
+        self.buffer.add_words(words)
 
-    def run(self):
+    async def run(self):
         try:
             # 1. Handshake: Extract Client Info
+            udp_port = None
+            # Receive length-prefixed metadata packet (Name|Lang[|udp:Port]) in full,
+            # however the client's writes were split; a short one never starts a session
             try:
-                # Receive metadata packet (Name|Lang)
-                raw_data = self.conn.recv(1024).decode('utf-8').strip()
-                if "|" in raw_data:
-                    self.client_name, selected_lang = raw_data.split("|", 1)
-                else:
-                    self.client_name = raw_data
-                    selected_lang = "en"
-            except Exception:
+                header = await asyncio.wait_for(self.reader.readexactly(HANDSHAKE_HEADER.size), HANDSHAKE_TIMEOUT)
+                (length,) = HANDSHAKE_HEADER.unpack(header)
+                if length > HANDSHAKE_MAX_BYTES:
+                    raise ConnectionError(f"handshake length {length} exceeds {HANDSHAKE_MAX_BYTES}")
+                payload = await asyncio.wait_for(self.reader.readexactly(length), HANDSHAKE_TIMEOUT)
+            except asyncio.IncompleteReadError:
+                raise ConnectionError("client closed during handshake") from None
+            except asyncio.TimeoutError:
+                raise ConnectionError(f"no handshake within {HANDSHAKE_TIMEOUT}s") from None
+            try:
+                parts = payload.decode('utf-8').strip().split("|")
+                self.client_name = parts[0]
+                selected_lang = parts[1] if len(parts) > 1 else "en"
+                if len(parts) > 2 and parts[2].startswith("udp:"):
+                    udp_port = int(parts[2][4:])
+            except ValueError: # Undecodable payload or bad port: serve it with defaults
                 self.client_name = f"Client-{self.addr[1]}"
                 selected_lang = "en"
+            # Client holds audio back until this arrives
+            self.writer.write(HANDSHAKE_ACK)
+            await self.writer.drain()
+            
+            # Audio arrives on this stream, or as datagrams routed to a per-client channel
+            source = self.reader
+            if udp_port:
+                source = DatagramChannel(self.reader)
+                self.udp_route = (self.addr[0], udp_port)
+                self.udp_routes[self.udp_route] = source
             
             # Sync buffer with actual client name
             self.buffer.client_name = self.client_name
             
             self.signals.client_connected.emit(self.client_name, selected_lang)
-            self.signals.log_message.emit(f"New connection: {self.client_name} (Lang: {selected_lang})")
+            transport = "UDP" if udp_port else "TCP"
+            self.signals.log_message.emit(f"New connection: {self.client_name} (Lang: {selected_lang}, {transport})")
             
             # 2. Configure Speechmatics Connection
             self.ws = WebsocketClient(
@@ -299,40 +417,103 @@ class ClientHandler(threading.Thread):
                 # Punctuation overrides removed to allow natural full punctuation
             )
             
-            # 3. Reactive Socket Stream
+            # 3. Reactive Socket Stream: pump() reads the client, Speechmatics drains via read()
             class SocketStream:
-                def __init__(self, conn, signals, client_name):
-                    self.conn = conn
+                THRESH_SQ = 150 * 150 # Activity RMS threshold, squared so no sqrt is needed
+                
+                def __init__(self, source, signals, client_name):
+                    self.source = source
                     self.signals = signals
                     self.client_name = client_name
+                    self._last_active = None
+                    self._last_emit = 0.0
+                    self.chunks = asyncio.Queue()
+                    self._queued = 0 # Bytes in self.chunks
+                    self._space = asyncio.Event() # Set by read() whenever it takes a chunk
+                    self._last_take = 0.0 # Monotonic time read() last took a chunk (or found the queue drained)
+                    self._pump = None
+                    self.dropped = 0 # Bytes
                     
-                def read(self, size):
+                async def pump(self):
+                    """Reads the client ahead of Speechmatics (and updates the activity glow); drops only on a stall"""
+                    carry = b'' # Odd trailing byte of the last read
                     try:
-                        data = self.conn.recv(size)
-                        if not data: return b''
+                        while True:
+                            data = await self.source.read(CHUNK_SIZE - len(carry))
+                            if not data: break
+                            # Queue whole samples only, so dropping a chunk can't shift later ones by a byte
+                            data = carry + data
+                            cut = len(data) & ~1
+                            data, carry = data[:cut], data[cut:]
+                            if data:
+                                self._detect_activity(data)
+                                await self._put(data)
+                    except Exception:
+                        pass
+                    finally:
+                        self.chunks.put_nowait(b'') # End of stream for read()
                         
-                        # Real-time Activity Detection for the Modern UI
-                        count = len(data) // 2
-                        if count > 0:
-                            sum_squares = 0
-                            # Sampling for performance
-                            for i in range(0, len(data), 20): 
-                                if i+2 <= len(data):
-                                    sample = int.from_bytes(data[i:i+2], byteorder='little', signed=True)
-                                    sum_squares += sample * sample
-                            
-                            rms = math.sqrt(sum_squares / (count / 10))
-                            # Trigger the "Neon Glow" on the server dashboard
-                            is_active = rms > 150 
+                async def _put(self, data):
+                    # Hand buffered audio over at Speechmatics' pace; only a stalled consumer costs audio
+                    if not self._queued:
+                        self._last_take = time.monotonic() # Consumer is caught up
+                    while self._queued and self._queued + len(data) > STREAM_QUEUE_BYTES:
+                        # Once read() has gone quiet for the stall budget, stop waiting and keep recv pace
+                        remaining = STREAM_STALL_TIMEOUT - (time.monotonic() - self._last_take)
+                        if remaining > 0:
+                            self._space.clear()
+                            try:
+                                await asyncio.wait_for(self._space.wait(), remaining)
+                                continue
+                            except asyncio.TimeoutError:
+                                pass
+                        # Drop the oldest: stay live rather than fall further behind
+                        dropped = len(self.chunks.get_nowait())
+                        self._queued -= dropped
+                        self.dropped += dropped
+                    self.chunks.put_nowait(data)
+                    self._queued += len(data)
+                    
+                async def read(self, size):
+                    if self._pump is None:
+                        # Speechmatics only starts reading once recognition has started; until
+                        # then the audio waits, undropped, in the socket or DatagramChannel
+                        self._pump = asyncio.create_task(self.pump())
+                    data = await self.chunks.get()
+                    self._queued -= len(data)
+                    self._last_take = time.monotonic()
+                    self._space.set()
+                    return data
+                    
+                def close(self):
+                    if self._pump:
+                        self._pump.cancel()
+                    
+                def _detect_activity(self, data):
+                    # Real-time Activity Detection for the Modern UI
+                    count = len(data) // 2
+                    if count > 0:
+                        # Full-chunk mean square; dot fuses square and sum (int64: an int32 sum wraps on loud chunks)
+                        samples = np.frombuffer(data, dtype='<i2', count=count).astype(np.int64)
+                        mean_sq = int(samples.dot(samples)) / count
+                        # Trigger the "Neon Glow" on the server dashboard
+                        is_active = mean_sq > self.THRESH_SQ
+                        # Emit on changes, plus a slow heartbeat, so N clients can't flood the GUI thread
+                        now = time.monotonic()
+                        if is_active != self._last_active or now - self._last_emit > ACTIVITY_HEARTBEAT:
+                            self._last_active = is_active
+                            self._last_emit = now
                             self.signals.audio_activity.emit(self.client_name, is_active)
-                        
-                        return data
-                    except Exception:
-                        return b''
             
-            # Start the synchronous streaming process
-            stream = SocketStream(self.conn, self.signals, self.client_name)
-            self.ws.run_synchronously(stream, conf, settings)
+            # Stream until the client goes away; other clients run alongside on the same loop
+            stream = SocketStream(source, self.signals, self.client_name)
+            try:
+                await self.ws.run(stream, conf, settings)
+            finally:
+                stream.close()
+                if stream.dropped:
+                    dropped_ms = stream.dropped * 1000 // (SAMPLE_RATE * 2)
+                    self.signals.log_message.emit(f"{self.client_name}: {dropped_ms} ms of audio dropped behind Speechmatics")
             
         except Exception as e:
             self.signals.log_message.emit(f"Error with {self.client_name}: {e}")
@@ -345,52 +526,83 @@ class ClientHandler(threading.Thread):
         if self.buffer:
             self.buffer.force_flush()
         
+        channel = self.udp_routes.pop(self.udp_route, None)
+        if channel and channel.lost:
+            self.signals.log_message.emit(f"{self.client_name}: {channel.lost} UDP packets lost")
+        
         self.signals.client_disconnected.emit(self.client_name)
         self.signals.log_message.emit(f"Disconnected: {self.client_name}")
         
         try:
-            self.conn.close()
+            self.writer.close()
         except:
             pass
 
 class ServerThread(threading.Thread):
-    """TCP Server to accept connections"""
+    """Runs one asyncio loop that accepts clients and bridges each to Speechmatics as a task"""
     def __init__(self, signals):
         super().__init__()
         self.signals = signals
         self.running = True
-        self.server_socket = None
-        self.clients = []
+        self.loop = None
+        self._stopping = None
+        self.udp_routes = {}
+        self.clients = set() # handle_client tasks, cancelled on stop
 
     def run(self):
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         try:
-            self.server_socket.bind(('0.0.0.0', SERVER_PORT))
-            self.server_socket.listen(5)
-            self.signals.log_message.emit(f"Server listening on port {SERVER_PORT}...")
-            
-            while self.running:
-                try:
-                    conn, addr = self.server_socket.accept()
-                    client = ClientHandler(conn, addr, self.signals)
-                    client.daemon = True
-                    client.start()
-                    self.clients.append(client)
-                except OSError:
-                    break
+            asyncio.run(self.serve())
         except Exception as e:
             self.signals.log_message.emit(f"Server error: {e}")
+
+    async def serve(self):
+        self._stopping = asyncio.Event()
+        self.loop = asyncio.get_running_loop()
+        
+        server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        try:
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            # Set before bind so the window scale negotiated for accepted sockets allows it
+            server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+            server_socket.bind(('0.0.0.0', SERVER_PORT))
+        except OSError:
+            server_socket.close()
+            raise
+        server = await asyncio.start_server(self.handle_client, sock=server_socket)
+        
+        # UDP audio shares the port number; the TCP handshake registers each sender
+        udp_transport, _ = await self.loop.create_datagram_endpoint(
+            lambda: UdpRouter(self.udp_routes), local_addr=('0.0.0.0', SERVER_PORT))
+        self.signals.log_message.emit(f"Server listening on port {SERVER_PORT}...")
+        
+        try:
+            if self.running:
+                await self._stopping.wait()
         finally:
-            if self.server_socket:
-                self.server_socket.close()
+            server.close()
+            udp_transport.close()
+            for task in list(self.clients):
+                task.cancel()
+            await asyncio.gather(*self.clients, return_exceptions=True)
+
+    async def handle_client(self, reader, writer):
+        # asyncio already sets TCP_NODELAY on accepted sockets
+        writer.get_extra_info('socket').setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF)
+        task = asyncio.current_task()
+        self.clients.add(task)
+        try:
+            await ClientHandler(reader, writer, self.signals, self.udp_routes).run()
+        finally:
+            self.clients.discard(task)
 
     def stop(self):
+        """Called from the GUI thread"""
         self.running = False
-        if self.server_socket:
-            self.server_socket.close()
-        for client in self.clients:
-            client.cleanup()
+        if self.loop:
+            try:
+                self.loop.call_soon_threadsafe(self._stopping.set)
+            except RuntimeError:
+                pass # Loop already closed
 
 class ServerApp(QMainWindow):
     def __init__(self):
@@ -400,6 +612,21 @@ class ServerApp(QMainWindow):
         self.client_widgets = {} # name -> ClientWidget
         self.last_client = None
         self.client_paragraphs = {}
+        # Queued [client_name, [text, ...]] runs, rendered together by _flush_pending
+        self._pending = []
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(TRANSCRIPT_FLUSH_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
+        # Continuation text goes in as plain text with this format, skipping the HTML parser
+        self._body_fmt = QTextCharFormat()
+        self._body_fmt.setFontFamilies(["Segoe UI", "sans-serif"])
+        self._body_fmt.setFontPointSize(12)
+        # Shared 20fps pulse for all active client widgets
+        self._active_clients = set()
+        self._pulse_tick = QTimer(self)
+        self._pulse_tick.setInterval(50)
+        self._pulse_tick.timeout.connect(self._pulse_all)
         self.init_ui()
         
         # Connect signals
@@ -416,6 +643,8 @@ class ServerApp(QMainWindow):
         self.server_thread.start()
 
     def export_transcript(self):
+        self._flush_pending() # Include words still waiting for the next frame
+        
         # 1. Check if there is actually content to save
         content = self.transcript_area.toPlainText().strip()
         if not content:
@@ -478,6 +707,7 @@ class ServerApp(QMainWindow):
         self.transcript_area = QTextEdit()
         self.transcript_area.setReadOnly(True)
         self.transcript_area.setFont(QFont("Arial", 12))
+        self.transcript_area.document().setMaximumBlockCount(TRANSCRIPT_MAX_BLOCKS)
         left_layout.addWidget(self.transcript_area)
         
         layout.addLayout(left_layout, stretch=2)
@@ -514,6 +744,7 @@ class ServerApp(QMainWindow):
         self.log_area = QTextEdit()
         self.log_area.setReadOnly(True)
         self.log_area.setFont(QFont("Courier New", 10))
+        self.log_area.document().setMaximumBlockCount(LOG_MAX_BLOCKS)
         right_layout.addWidget(self.log_area)
         
         layout.addLayout(right_layout, stretch=1)
@@ -525,24 +756,39 @@ class ServerApp(QMainWindow):
         else:
             self.setStyleSheet(LIGHT_STYLE)
             self.btn_theme.setText("🌙 Dark Mode")       
+        
+        is_dark = self.btn_theme.isChecked()
+        for widget in self.client_widgets.values():
+            widget.is_dark = is_dark
+            widget.update()
 
     def add_transcript(self, client_name, text):
+        """Queues streamed text; consecutive words from one client become one run"""
+        if self._pending and self._pending[-1][0] == client_name:
+            self._pending[-1][1].append(text)
+        else:
+            self._pending.append([client_name, [text]])
+        if not self._flush_timer.isActive():
+            self._flush_timer.start()
+
+    def _flush_pending(self):
+        runs, self._pending = self._pending, []
+        for client_name, parts in runs:
+            self._render_transcript(client_name, "".join(parts))
+
+    def _render_transcript(self, client_name, text):
         # Merge if same client speaks consecutively
         if self.last_client == client_name:
             # Append to valid existing block
             cursor = self.transcript_area.textCursor()
             cursor.movePosition(QTextCursor.MoveOperation.End)
-            self.transcript_area.setTextCursor(cursor)
             
-            # Handle leading space explicitly to avoid HTML collapsing it
-            if text.startswith(" "):
-                self.transcript_area.insertPlainText(" ")
-                text = text.lstrip()
-                
-            if text:
-                self.transcript_area.insertHtml(f"<span style='font-family: \"Segoe UI\", sans-serif; line-height: 1.5;'>{text}</span>")
+            # Plain text keeps the leading space as-is, no HTML collapsing to work around
+            cursor.insertText(text, self._body_fmt)
             
-            self.transcript_area.moveCursor(QTextCursor.MoveOperation.End) # Ensure scrolling
+            # The cursor already sits after the inserted text; hand it back once and scroll
+            self.transcript_area.setTextCursor(cursor)
+            self.transcript_area.ensureCursorVisible()
         else:
             # New Block
             self.last_client = client_name
@@ -575,6 +821,7 @@ class ServerApp(QMainWindow):
     def on_client_connect(self, name, lang_code):
         if name not in self.client_widgets:
             widget = ClientWidget(name, lang_code)
+            widget.is_dark = self.btn_theme.isChecked()
             self.client_widgets[name] = widget
             
             # Add to grid
@@ -589,10 +836,38 @@ class ServerApp(QMainWindow):
             self.clients_grid.removeWidget(widget)
             widget.deleteLater()
             del self.client_widgets[name]
+            self._active_clients.discard(name)
+            self._sync_pulse_tick()
+            
+            # Reflow survivors into the lowest cells so the next connect (placed by count) can't overlap one
+            widgets = list(self.client_widgets.values())
+            for w in widgets:
+                self.clients_grid.removeWidget(w)
+            for i, w in enumerate(widgets):
+                self.clients_grid.addWidget(w, i // 3, i % 3)
 
     def on_audio_activity(self, name, is_active):
         if name in self.client_widgets:
             self.client_widgets[name].set_active(is_active)
+            if is_active:
+                self._active_clients.add(name)
+            else:
+                self._active_clients.discard(name)
+            self._sync_pulse_tick()
+
+    def _sync_pulse_tick(self):
+        """One timer drives every pulse; it only runs while some client is active"""
+        if self._active_clients:
+            if not self._pulse_tick.isActive():
+                self._pulse_tick.start()
+        else:
+            self._pulse_tick.stop()
+
+    def _pulse_all(self):
+        for name in self._active_clients:
+            widget = self.client_widgets.get(name)
+            if widget and widget.is_on_screen():
+                widget.update_pulse()
 
     def log(self, msg):
         ts = datetime.now().strftime("%H:%M:%S")